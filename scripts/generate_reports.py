@@ -0,0 +1,957 @@
+"""
+Generate Static District Reports
+Turns the notebook 05-07 analyses (safety scores, K-Means clusters, investment
+recommendations) into one HTML report per district plus a city summary.
+
+Figures are drawn headless (Agg backend) across a process pool. Every figure
+and table is cached under reports/cache/, keyed by the version of its input
+data and its parameters, so a nightly run only re-renders what changed.
+
+Usage:
+    python scripts/generate_reports.py              # HTML reports
+    python scripts/generate_reports.py --pdf        # also write PDFs
+    python scripts/generate_reports.py --force      # ignore the cache
+"""
+
+import argparse
+import functools
+import hashlib
+import html
+import inspect
+import io
+import json
+import os
+import sqlite3
+import sys
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")  # Headless rendering - must be set before pyplot import
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.stats import variation
+from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+# Paths
+DB_PATH = "database/berlin_intelligence.db"
+REPORTS_DIR = Path("reports")
+CACHE_DIR = REPORTS_DIR / "cache"
+
+# Bump when shared styling (colors, matplotlib style) changes so cached
+# sections are redrawn - renderer code itself is hashed into the cache key
+RENDER_VERSION = 1
+
+# Analysis parameters (notebooks 06 and 07)
+CLUSTER_FEATURES = ['crime_per_100k', 'avg_price', 'total_population', 'population_density']
+CLUSTER_K = 3
+RANDOM_STATE = 42
+CLUSTER_COLORS = ['gold', 'lightblue', 'salmon', 'lightgreen', 'plum', 'khaki', 'lightgray']
+PDF_PAGE_SIZE = (11.69, 8.27)  # A4 landscape, inches
+
+# Crime atlas categories that sum other listed offenses - excluded from the
+# Top Crime Types table so cases are not counted twice
+AGGREGATE_CRIME_TYPES = [
+    'Total Crimes',
+    'Theft Total',
+    'Assault Total',
+    'Arson Total',
+    'Property Damage Total',
+    'Neighborhood Crimes',  # Vehicle/bicycle theft, graffiti, property damage, ...
+    'Robbery',              # Includes Street Robbery
+]
+
+
+# ============================================================================
+# DATA LOADING
+# ============================================================================
+
+def load_data(db_path=DB_PATH):
+    """Load the district-level source tables used by notebooks 05-07"""
+    conn = sqlite3.connect(db_path)
+
+    crime = pd.read_sql_query("""
+        SELECT
+            c.*,
+            p.total_population
+        FROM crime_statistics c
+        LEFT JOIN district_population p ON c.district_id = p.district_id
+        WHERE p.total_population IS NOT NULL
+    """, conn)
+
+    prices = pd.read_sql_query("""
+        SELECT
+            district_name as district,
+            AVG(standard_land_value) as avg_price
+        FROM land_prices
+        WHERE typical_land_use_type LIKE 'W%'
+        GROUP BY district_name
+    """, conn)
+
+    data = {
+        'crime': crime,
+        'prices': prices,
+        'population': pd.read_sql_query("SELECT district, total_population FROM district_population", conn),
+        'transport_metrics': pd.read_sql_query("SELECT * FROM district_transport_metrics", conn),
+        'school_metrics': pd.read_sql_query("SELECT * FROM district_school_metrics", conn),
+    }
+
+    conn.close()
+    return data
+
+
+# ============================================================================
+# ANALYSES (notebooks 05, 06, 07)
+# ============================================================================
+
+def get_safety_tier(score):
+    """Map a 0-100 safety score to its tier label (notebook 05)"""
+    if score >= 90: return "⭐⭐⭐⭐⭐ Excellent"
+    elif score >= 80: return "⭐⭐⭐⭐ Very Safe"
+    elif score >= 70: return "⭐⭐⭐ Safe"
+    elif score >= 60: return "⭐⭐ Moderate"
+    else: return "⭐ High Risk"
+
+
+def _inverted_scale(series, points):
+    """Min-max normalize to 0-points, lower raw value = higher score"""
+    span = series.max() - series.min()
+    if span == 0:
+        # No variation - give everyone the middle of the range
+        return pd.Series(points / 2, index=series.index)
+    return points * (1 - (series - series.min()) / span)
+
+
+def calculate_safety_scores(crime, start_year, end_year):
+    """Score districts 0-100: Rate(40) + Severity(30) + Trend(20) + Distribution(10)"""
+    # Component 1: crime rate per 100k residents
+    scores = crime.groupby('district').agg({
+        'total_number_cases': 'sum',
+        'total_population': 'first',
+        'severity_weight': 'mean'
+    }).reset_index()
+    scores['crime_per_100k'] = scores['total_number_cases'] / scores['total_population'] * 100000
+    scores['crime_rate_score'] = _inverted_scale(scores['crime_per_100k'], 40)
+
+    # Component 2: average severity
+    scores['severity_score'] = _inverted_scale(scores['severity_weight'], 30)
+
+    # Component 3: trend between first and last year
+    yearly = crime.groupby(['district', 'year'])['total_number_cases'].sum().unstack('year')
+    change = (yearly[end_year] - yearly[start_year]) / yearly[start_year] * 100
+    scores['crime_change_pct'] = scores['district'].map(change)
+    scores['trend_score'] = _inverted_scale(scores['crime_change_pct'], 20)
+
+    # Component 4: spread of crime across neighborhoods
+    neighborhoods = crime.groupby(['district', 'neighborhood'])['total_number_cases'].sum()
+    scores['crime_variation'] = scores['district'].map(neighborhoods.groupby('district').apply(variation))
+    scores['distribution_score'] = _inverted_scale(scores['crime_variation'], 10)
+
+    scores['total_safety_score'] = (
+        scores['crime_rate_score'] +
+        scores['severity_score'] +
+        scores['trend_score'] +
+        scores['distribution_score']
+    ).round(0)
+    scores['safety_tier'] = scores['total_safety_score'].apply(get_safety_tier)
+
+    return scores.sort_values('total_safety_score', ascending=False).reset_index(drop=True)
+
+
+def get_cluster_strategy(avg_crime, avg_price):
+    """Investment strategy for a cluster's average metrics (notebook 06)"""
+    if avg_crime < 400000 and avg_price > 1500:
+        return "HOLD/PREMIUM"
+    elif avg_price > 1200 and avg_crime > 600000:
+        return "SPECULATIVE HOLD"
+    elif avg_crime < 500000 and avg_price < 900:
+        return "STRONG BUY"
+    elif avg_crime > 700000 and avg_price < 500:
+        return "AVOID"
+    else:
+        return "MODERATE BUY"
+
+
+def cluster_districts(crime, prices, k, random_state):
+    """K-Means clustering with PCA projection for plotting (notebook 06)"""
+    df = crime.groupby(['district', 'district_id']).agg({
+        'total_number_cases': 'sum',
+        'total_population': 'first'
+    }).reset_index()
+    df['crime_per_100k'] = (df['total_number_cases'] * 100000.0 / df['total_population']).round(0)
+    df = df.merge(prices, on='district', how='left')
+    df['population_density'] = df['total_population'] / 100  # Simplified metric
+
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(df[CLUSTER_FEATURES])
+
+    kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=10)
+    df['cluster'] = kmeans.fit_predict(X_scaled)
+
+    pca = PCA(n_components=2)
+    X_pca = pca.fit_transform(X_scaled)
+    df['PC1'] = X_pca[:, 0]
+    df['PC2'] = X_pca[:, 1]
+
+    cluster_stats = df.groupby('cluster')[CLUSTER_FEATURES].mean()
+    centers_pca = pca.transform(scaler.transform(cluster_stats))
+    cluster_stats['center_PC1'] = centers_pca[:, 0]
+    cluster_stats['center_PC2'] = centers_pca[:, 1]
+    cluster_stats['strategy'] = [
+        get_cluster_strategy(row['crime_per_100k'], row['avg_price'])
+        for _, row in cluster_stats.iterrows()
+    ]
+    df['cluster_strategy'] = df['cluster'].map(cluster_stats['strategy'])
+
+    model = {
+        'silhouette': float(silhouette_score(X_scaled, df['cluster'])),
+        'inertia': float(kmeans.inertia_),
+        'explained_variance': [float(v) for v in pca.explained_variance_ratio_],
+    }
+    return df, cluster_stats.reset_index(), model
+
+
+def get_recommendation(value_score):
+    """Investment recommendation from a quality-vs-price value score (notebook 07)"""
+    if value_score > 35:
+        return "🟢 STRONG BUY"
+    elif value_score > 10:
+        return "🟡 BUY"
+    elif value_score > -15:
+        return "🟠 HOLD"
+    else:
+        return "🔴 AVOID"
+
+
+def _min_max(series):
+    return (series - series.min()) / (series.max() - series.min()) * 100
+
+
+def calculate_amenity_scores(crime, prices, population, transport_metrics, school_metrics):
+    """Quality of life, value scores and recommendations (notebook 07)"""
+    crime_totals = crime.groupby('district')['total_number_cases'].sum().rename('total_crimes').reset_index()
+
+    df = population.copy()
+    df = df.merge(transport_metrics, on='district', how='left')
+    df = df.merge(school_metrics, on='district', how='left')
+    df = df.merge(crime_totals, on='district', how='left')
+    df = df.merge(prices, on='district', how='left')
+
+    # Density metrics (per 100k residents)
+    df['transport_density'] = (df['transport_stops_count'] / df['total_population'] * 100000).round(1)
+    df['school_density'] = (df['schools_count'] / df['total_population'] * 100000).round(1)
+    df['crime_per_100k'] = (df['total_crimes'] / df['total_population'] * 100000).round(0)
+
+    df['amenity_score'] = (
+        (df['transport_density'] / df['transport_density'].max() * 50) +
+        (df['school_density'] / df['school_density'].max() * 50)
+    ).round(1)
+
+    # Quality of life index (equal weighting)
+    df['transport_score'] = _min_max(df['transport_density']).round(1)
+    df['school_score'] = _min_max(df['school_density']).round(1)
+    df['safety_score'] = (100 - _min_max(df['crime_per_100k'])).round(1)
+    df['quality_score'] = (
+        df['transport_score'] * 0.33 +
+        df['school_score'] * 0.33 +
+        df['safety_score'] * 0.34
+    ).round(1)
+
+    # Value = quality relative to price
+    df['price_percentile'] = _min_max(df['avg_price']).round(1)
+    df['value_score'] = (df['quality_score'] - df['price_percentile']).round(1)
+    df['recommendation'] = df['value_score'].apply(get_recommendation)
+
+    correlations = {}
+    for name, col in [('Transport Density', 'transport_density'),
+                      ('School Density', 'school_density'),
+                      ('Crime Rate', 'crime_per_100k'),
+                      ('Combined Amenities', 'amenity_score')]:
+        valid = df[[col, 'avg_price']].dropna()
+        r, p = stats.pearsonr(valid[col], valid['avg_price'])
+        correlations[name] = {'r': float(r), 'p': float(p)}
+
+    return df.sort_values('value_score', ascending=False).reset_index(drop=True), correlations
+
+
+# ============================================================================
+# FIGURES (run inside worker processes)
+# ============================================================================
+
+def _label(ax, df, x, y, short=False):
+    for _, row in df.iterrows():
+        name = row['district'][:4] if short else row['district']
+        ax.annotate(name, xy=(row[x], row[y]), xytext=(5, 5), textcoords='offset points', fontsize=8)
+
+
+def _add_trendline(ax, x, y, color):
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    if mask.sum() > 1:
+        z = np.polyfit(x[mask], y[mask], 1)
+        x_line = np.linspace(x[mask].min(), x[mask].max(), 100)
+        ax.plot(x_line, np.poly1d(z)(x_line), color=color, linewidth=2, linestyle='--',
+                alpha=0.8, label=f'Trend: y={z[0]:.1f}x+{z[1]:.0f}')
+        ax.legend(loc='best')
+
+
+def plot_safety_overview(payload):
+    """City safety dashboard: totals, components, rate vs score, tiers"""
+    scores = payload['scores']
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    colors = ['darkgreen' if x >= 80 else 'green' if x >= 70 else 'orange' if x >= 60 else 'red'
+              for x in scores['total_safety_score']]
+    axes[0, 0].barh(scores['district'], scores['total_safety_score'], color=colors, alpha=0.8)
+    axes[0, 0].set_xlabel('Safety Score (0-100)', fontweight='bold')
+    axes[0, 0].set_title('Total Safety Scores by District', fontsize=14, fontweight='bold')
+    axes[0, 0].set_xlim(0, 100)
+    axes[0, 0].axvline(70, color='gray', linestyle='--', alpha=0.5, label='Safe Threshold (70)')
+    axes[0, 0].legend()
+    axes[0, 0].invert_yaxis()
+
+    components = ['crime_rate_score', 'severity_score', 'trend_score', 'distribution_score']
+    labels = ['Crime Rate (40)', 'Severity (30)', 'Trend (20)', 'Distribution (10)']
+    bottom = np.zeros(len(scores))
+    for component, label in zip(components, labels):
+        axes[0, 1].barh(scores['district'], scores[component], left=bottom, label=label, alpha=0.8)
+        bottom += scores[component].values
+    axes[0, 1].set_xlabel('Score Breakdown', fontweight='bold')
+    axes[0, 1].set_title('Safety Score Components (Stacked)', fontsize=14, fontweight='bold')
+    axes[0, 1].legend(loc='lower right')
+    axes[0, 1].invert_yaxis()
+
+    axes[1, 0].scatter(scores['crime_per_100k'], scores['total_safety_score'], s=200, alpha=0.6,
+                       c=scores['total_safety_score'], cmap='RdYlGn', edgecolors='black')
+    _label(axes[1, 0], scores, 'crime_per_100k', 'total_safety_score', short=True)
+    axes[1, 0].set_xlabel('Crime per 100k Residents', fontweight='bold')
+    axes[1, 0].set_ylabel('Total Safety Score', fontweight='bold')
+    axes[1, 0].set_title('Crime Rate vs Safety Score', fontsize=14, fontweight='bold')
+
+    # Matplotlib's default font has no star glyph, so drop it from the labels
+    tier_counts = scores['safety_tier'].str.replace('⭐', '').str.strip().value_counts()
+    axes[1, 1].pie(tier_counts.values, labels=tier_counts.index, autopct='%1.0f%%', startangle=90)
+    axes[1, 1].set_title('Districts by Safety Tier', fontsize=14, fontweight='bold')
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_cluster_pca(payload):
+    """K-Means clusters projected onto the first two principal components"""
+    clusters, centers = payload['clusters'], payload['centers']
+    pc1, pc2 = payload['explained_variance']
+    fig, ax = plt.subplots(figsize=(14, 10))
+
+    for cluster_id, group in clusters.groupby('cluster'):
+        strategy = centers.loc[centers['cluster'] == cluster_id, 'strategy'].iloc[0]
+        ax.scatter(group['PC1'], group['PC2'], s=400, alpha=0.6,
+                   c=CLUSTER_COLORS[cluster_id % len(CLUSTER_COLORS)], edgecolors='black', linewidth=2,
+                   label=f'Cluster {cluster_id}: {strategy}')
+    for _, row in clusters.iterrows():
+        ax.annotate(row['district'], xy=(row['PC1'], row['PC2']), xytext=(5, 5),
+                    textcoords='offset points', fontsize=10, fontweight='bold',
+                    bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7))
+    ax.scatter(centers['center_PC1'], centers['center_PC2'], s=500, c='red', marker='X',
+               edgecolors='black', linewidth=3, label='Cluster Centers', zorder=10)
+
+    ax.set_xlabel(f'First Principal Component ({pc1 * 100:.1f}% variance)', fontsize=12, fontweight='bold')
+    ax.set_ylabel(f'Second Principal Component ({pc2 * 100:.1f}% variance)', fontsize=12, fontweight='bold')
+    ax.set_title('Berlin Districts: K-Means Clustering (PCA Visualization)', fontsize=14, fontweight='bold')
+    ax.legend(loc='best', fontsize=11, framealpha=0.9)
+    fig.tight_layout()
+    return fig
+
+
+def plot_amenity_correlations(payload):
+    """Transport, schools, crime and combined amenities against price"""
+    df, correlations = payload['amenities'], payload['correlations']
+    panels = [
+        ('transport_density', 'Transport Density', 'Transport Stops per 100k People', 'blue', 'darkblue'),
+        ('school_density', 'School Density', 'Schools per 100k People', 'green', 'darkgreen'),
+        ('crime_per_100k', 'Crime Rate', 'Crime Rate per 100k People', 'red', 'darkred'),
+        ('amenity_score', 'Combined Amenities', 'Combined Amenity Score (0-100)', 'purple', 'darkviolet'),
+    ]
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    for ax, (col, name, xlabel, color, trend_color) in zip(axes.flat, panels):
+        ax.scatter(df[col], df['avg_price'], s=200, alpha=0.6, c=color, edgecolors='black')
+        _add_trendline(ax, df[col].values.astype(float), df['avg_price'].values.astype(float), trend_color)
+        _label(ax, df, col, 'avg_price')
+        ax.set_xlabel(xlabel, fontweight='bold')
+        ax.set_ylabel('Avg Property Price (€/sqm)', fontweight='bold')
+        ax.set_title(f"{name} vs Price (r={correlations[name]['r']:.3f})", fontweight='bold', fontsize=12)
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_district_safety_rank(payload):
+    """All districts' safety scores with the report's district highlighted"""
+    scores, district = payload['scores'], payload['district']
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    colors = ['darkorange' if d == district else 'lightgray' for d in scores['district']]
+    ax.barh(scores['district'], scores['total_safety_score'], color=colors, edgecolor='black')
+    ax.axvline(70, color='gray', linestyle='--', alpha=0.5, label='Safe Threshold (70)')
+    ax.set_xlim(0, 100)
+    ax.set_xlabel('Safety Score (0-100)', fontweight='bold')
+    ax.set_title(f'{district}: Safety Score vs Other Districts', fontsize=13, fontweight='bold')
+    ax.legend(loc='lower right')
+    ax.invert_yaxis()
+    fig.tight_layout()
+    return fig
+
+
+def plot_district_crime_trend(payload):
+    """Yearly recorded cases for one district"""
+    yearly, district = payload['yearly'], payload['district']
+    fig, ax = plt.subplots(figsize=(10, 5))
+
+    ax.plot(yearly['year'], yearly['total_number_cases'], 'o-', color='darkred', linewidth=2, markersize=8)
+    ax.set_xticks(yearly['year'])
+    ax.set_xlabel('Year', fontweight='bold')
+    ax.set_ylabel('Recorded Cases', fontweight='bold')
+    ax.set_title(f'{district}: Crime Trend', fontsize=13, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def plot_district_value_position(payload):
+    """Quality of life vs price, colored by cluster, report's district highlighted"""
+    df, district = payload['districts'], payload['district']
+    fig, ax = plt.subplots(figsize=(10, 7))
+
+    for cluster_id, group in df.groupby('cluster'):
+        ax.scatter(group['quality_score'], group['avg_price'], s=200, alpha=0.6,
+                   c=CLUSTER_COLORS[cluster_id % len(CLUSTER_COLORS)], edgecolors='black',
+                   label=f'Cluster {cluster_id}')
+    target = df[df['district'] == district]
+    ax.scatter(target['quality_score'], target['avg_price'], s=500, facecolors='none',
+               edgecolors='red', linewidth=3, label=district, zorder=10)
+    _label(ax, df, 'quality_score', 'avg_price')
+    ax.set_xlabel('Quality of Life Score (0-100)', fontweight='bold')
+    ax.set_ylabel('Avg Property Price (€/sqm)', fontweight='bold')
+    ax.set_title(f'{district}: Quality vs Price', fontsize=13, fontweight='bold')
+    ax.legend(loc='best')
+    fig.tight_layout()
+    return fig
+
+
+FIGURES = {
+    'safety_overview': plot_safety_overview,
+    'cluster_pca': plot_cluster_pca,
+    'amenity_correlations': plot_amenity_correlations,
+    'district_safety_rank': plot_district_safety_rank,
+    'district_crime_trend': plot_district_crime_trend,
+    'district_value_position': plot_district_value_position,
+}
+
+
+def render_figure(kind, payload, path):
+    """Draw one figure and write it to path (process pool entry point)"""
+    plt.style.use('seaborn-v0_8')
+    fig = FIGURES[kind](payload)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=100)
+    plt.close(fig)
+    _atomic_write(path, buffer.getvalue())
+    return path
+
+
+def _plain(text):
+    """Drop emoji the default matplotlib font cannot draw (⭐, 🟢, ...)"""
+    return ' '.join(''.join(c for c in str(text) if ord(c) < 0x2600).split()).replace('( ', '(')
+
+
+def _pdf_table(ax, table):
+    """Draw a formatted table into an axes, columns sized by content"""
+    ax.axis('off')
+    if table.empty:
+        ax.text(0, 0.5, 'No data', fontsize=9)
+        return
+    labels = [_plain(col) for col in table.columns]
+    cells = [[_plain(value) for value in row] for row in table.values]
+    widths = [max(len(label), *(len(row[i]) for row in cells)) + 2 for i, label in enumerate(labels)]
+    drawn = ax.table(cellText=cells, colLabels=labels, colWidths=[w / sum(widths) for w in widths],
+                     cellLoc='left', bbox=[0, 0, 1, 1])
+    drawn.auto_set_font_size(False)
+    drawn.set_fontsize(8)
+    for (row, _), cell in drawn.get_celld().items():
+        cell.PAD = 0.02  # Default padding is 10% of the cell width
+        if row == 0:
+            cell.set_text_props(fontweight='bold')
+            cell.set_facecolor('#f3f3f3')
+
+
+def render_pdf(payload, path):
+    """Write a report's tables and figures as a PDF (process pool entry point)"""
+    buffer = io.BytesIO()
+    with PdfPages(buffer, metadata={'CreationDate': None}) as pdf:
+        # Page 1: title, headline and tables
+        fig = plt.figure(figsize=PDF_PAGE_SIZE)
+        fig.text(0.04, 0.96, _plain(payload['title']), fontsize=18, fontweight='bold', va='top')
+        fig.text(0.04, 0.91, _plain(payload['highlight']), fontsize=13, fontweight='bold',
+                 color='darkred', va='top')
+        rows = [len(table) + 3 for _, table in payload['tables']]
+        top = 0.82
+        for (heading, table), n in zip(payload['tables'], rows):
+            height = 0.76 * n / sum(rows)
+            ax = fig.add_axes([0.04, top - height + 0.03, 0.92, height - 0.03])
+            ax.set_title(_plain(heading), loc='left', fontsize=12, fontweight='bold')
+            _pdf_table(ax, table)
+            top -= height
+        pdf.savefig(fig)
+        plt.close(fig)
+
+        # One page per cached figure (each carries its own title)
+        for image in payload['figures']:
+            fig, ax = plt.subplots(figsize=PDF_PAGE_SIZE)
+            ax.imshow(plt.imread(image))
+            ax.axis('off')
+            fig.tight_layout()
+            pdf.savefig(fig)
+            plt.close(fig)
+    _atomic_write(path, buffer.getvalue())
+    return path
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _atomic_write(path, content):
+    """Write via a temp file so a killed run never leaves a truncated cache hit"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _fingerprint(value):
+    """Stable digest of a payload value (DataFrames hashed by content)"""
+    if isinstance(value, pd.DataFrame):
+        digest = hashlib.sha256(json.dumps(list(map(str, value.columns))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+        return digest.hexdigest()
+    if isinstance(value, dict):
+        return {k: _fingerprint(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint(v) for v in value]
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(renderer, group):
+    """Digest of the source code of a section's renderer and its group's shared helpers"""
+    digest = hashlib.sha256(matplotlib.__version__.encode())
+    for func in (renderer,) + SHARED_RENDERERS[group]:
+        digest.update(inspect.getsource(func).encode())
+    return digest.hexdigest()
+
+
+def cache_key(kind, payload, renderer=None, group=None):
+    """Key a section by its renderer's code, section kind and its inputs/parameters"""
+    spec = {
+        'version': RENDER_VERSION,
+        'kind': kind,
+        'renderer': _source_digest(renderer, group) if renderer else None,
+        'inputs': _fingerprint(payload),
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()[:20]
+
+
+class SectionCache:
+    """Content-addressed store for rendered figures (.png) and tables (.html)"""
+
+    def __init__(self, cache_dir, force=False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.force = force
+        self.pending = []  # Figures to render: (kind, payload, path)
+        self.pending_pdfs = []  # PDFs to render once figures exist: (payload, path)
+        self.used = set()
+        self.used_suffixes = set()  # Only prune kinds of entries this run looked up
+        self.hits = Counter()  # 'sections' (figures, tables) and 'pdfs'
+        self.misses = Counter()
+
+    def _lookup(self, kind, payload, suffix, renderer, group):
+        path = self.cache_dir / f"{kind}-{cache_key(kind, payload, renderer, group)}{suffix}"
+        self.used.add(path.name)
+        self.used_suffixes.add(suffix)
+        hit = path.exists() and not self.force
+        counter = self.hits if hit else self.misses
+        counter['pdfs' if group == 'pdfs' else 'sections'] += 1
+        return path, hit
+
+    def figure(self, kind, payload):
+        """Return the figure's cache path, queueing a render if it is missing"""
+        path, hit = self._lookup(kind, payload, '.png', FIGURES[kind], 'figures')
+        if not hit and all(p != path for _, _, p in self.pending):
+            self.pending.append((kind, payload, path))
+        return path
+
+    def table(self, kind, payload, build):
+        """Return a table's HTML, building and storing it if it is missing"""
+        path, hit = self._lookup(kind, payload, '.html', build, 'tables')
+        if hit:
+            return path.read_text(encoding='utf-8')
+        content = build(payload).to_html(index=False, classes='data', border=0)
+        _atomic_write(path, content)
+        return content
+
+    def pdf(self, title, highlight, tables, figures):
+        """Return a report PDF's cache path, queueing a render if it is missing"""
+        # Figure file names are content keys, so together with the formatted
+        # tables they fully identify the PDF
+        payload = {
+            'title': title,
+            'highlight': highlight,
+            'tables': tables,
+            'figures': [str(path) for _, path in figures],
+        }
+        path, hit = self._lookup('report_pdf', payload, '.pdf', render_pdf, 'pdfs')
+        if not hit and all(p != path for _, p in self.pending_pdfs):
+            self.pending_pdfs.append((payload, path))
+        return path
+
+    def render_pending(self, workers):
+        """Draw all queued figures, then the PDFs embedding them, across a process pool"""
+        if not self.pending and not self.pending_pdfs:
+            return 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch in ([(render_figure, kind, payload, str(path)) for kind, payload, path in self.pending],
+                          [(render_pdf, payload, str(path)) for payload, path in self.pending_pdfs]):
+                for future in [pool.submit(*job) for job in batch]:
+                    future.result()
+        rendered = len(self.pending)
+        self.pending = []
+        self.pending_pdfs = []
+        return rendered
+
+    def prune(self):
+        """Delete cache entries not referenced by this run"""
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            # Leftover temp files come from killed runs; a run without --pdf
+            # never looks up PDFs, so it leaves them for the next --pdf run
+            if path.suffix == '.tmp' or (path.suffix in self.used_suffixes and path.name not in self.used):
+                path.unlink()
+                removed += 1
+        return removed
+
+
+# ============================================================================
+# TABLES & HTML
+# ============================================================================
+
+def _format_table(df, columns, formats):
+    table = df[list(columns)].copy()
+    for col, fmt in formats.items():
+        table[col] = table[col].map(lambda v, fmt=fmt: fmt.format(v) if pd.notna(v) else '–')
+    return table.rename(columns=columns).astype(str)
+
+
+def build_ranking_table(payload):
+    """City-wide ranking of all districts"""
+    return _format_table(payload['districts'], {
+        'district': 'District',
+        'total_safety_score': 'Safety Score',
+        'safety_tier': 'Safety Tier',
+        'crime_per_100k': 'Crime / 100k',
+        'avg_price': 'Price (€/sqm)',
+        'quality_score': 'Quality Score',
+        'value_score': 'Value Score',
+        'cluster_strategy': 'Cluster Strategy',
+        'recommendation': 'Recommendation',
+    }, {
+        'total_safety_score': '{:.0f}/100',
+        'crime_per_100k': '{:,.0f}',
+        'avg_price': '€{:,.0f}',
+        'quality_score': '{:.1f}',
+        'value_score': '{:+.1f}',
+    })
+
+
+def build_cluster_table(payload):
+    """Average metrics and strategy per K-Means cluster"""
+    return _format_table(payload['centers'], {
+        'cluster': 'Cluster',
+        'districts': 'Districts',
+        'crime_per_100k': 'Avg Crime / 100k',
+        'avg_price': 'Avg Price (€/sqm)',
+        'strategy': 'Strategy',
+    }, {
+        'crime_per_100k': '{:,.0f}',
+        'avg_price': '€{:,.0f}',
+    })
+
+
+def build_district_metrics_table(payload):
+    """Headline metrics for one district"""
+    row = payload['row']
+    metrics = pd.DataFrame([
+        ('Safety score', f"{row['total_safety_score']:.0f}/100 ({row['safety_tier']})"),
+        ('Safety rank', f"#{row['safety_rank']} of {row['district_count']}"),
+        ('Crime per 100k residents', f"{row['crime_per_100k']:,.0f}"),
+        (f"Crime change {row['start_year']}→{row['end_year']}", f"{row['crime_change_pct']:+.1f}%"),
+        ('Avg residential land price', f"€{row['avg_price']:,.0f}/sqm"),
+        ('Transport stops per 100k', f"{row['transport_density']:,.1f}"),
+        ('Schools per 100k', f"{row['school_density']:,.1f}"),
+        ('Quality of life score', f"{row['quality_score']:.1f}/100"),
+        ('Value score', f"{row['value_score']:+.1f}"),
+        ('Cluster', f"{row['cluster']} ({row['cluster_strategy']})"),
+        ('Recommendation', row['recommendation']),
+    ], columns=['Metric', 'Value'])
+    return metrics
+
+
+def build_crime_types_table(payload):
+    """Most frequent crime types in a district's latest year"""
+    return _format_table(payload['crime_types'], {
+        'crime_type_english': 'Crime Type',
+        'category': 'Category',
+        'total_number_cases': 'Cases',
+    }, {
+        'total_number_cases': '{:,.0f}',
+    })
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; max-width: 1100px; margin: 2em auto; color: #222; }}
+h1 {{ border-bottom: 3px solid #333; padding-bottom: .3em; }}
+img {{ max-width: 100%; margin: 1em 0; }}
+table.data {{ border-collapse: collapse; margin: 1em 0; }}
+table.data th, table.data td {{ padding: .35em .8em; border-bottom: 1px solid #ddd; text-align: left; }}
+table.data th {{ background: #f3f3f3; }}
+nav a {{ margin-right: 1em; }}
+footer {{ color: #888; font-size: .85em; margin-top: 3em; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+<h1>{title}</h1>
+{body}
+<footer>{footer}</footer>
+</body>
+</html>
+"""
+
+
+def slugify(name):
+    """Ascii file name for a district (Treptow-Köpenick -> treptow-kopenick)"""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return '-'.join(ascii_name.lower().replace('/', ' ').split())
+
+
+def _figure_html(path, alt):
+    return f'<img src="{path.parent.name}/{path.name}" alt="{html.escape(alt)}">'
+
+
+def render_page(title, nav, sections, footer=''):
+    body = '\n'.join(f"<h2>{html.escape(heading)}</h2>\n{content}" for heading, content in sections)
+    return PAGE_TEMPLATE.format(title=html.escape(title), nav=nav, body=body, footer=footer)
+
+
+def write_if_changed(path, content):
+    """Write a report only when its content differs from what is on disk"""
+    path = Path(path)
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    if path.exists() and path.read_bytes() == content:
+        return False
+    _atomic_write(path, content)
+    return True
+
+
+# Helpers shared by the renderers of each section type, hashed into the cache
+# keys of that type only - a PDF layout tweak must not redraw every figure
+SHARED_RENDERERS = {
+    'figures': (_label, _add_trendline, render_figure),
+    'tables': (_format_table, SectionCache.table),
+    'pdfs': (_plain, _pdf_table),
+}
+
+
+# ============================================================================
+# REPORT ASSEMBLY
+# ============================================================================
+
+def _table_frames(tables):
+    """Formatted tables for a PDF, built from the same specs as the HTML page"""
+    return [(heading, build(payload)) for heading, _, payload, build in tables]
+
+
+def build_reports(data, cache, workers, pdf=False):
+    """Compute analyses, resolve sections against the cache and write reports"""
+    crime = data['crime']
+    start_year, end_year = int(crime['year'].min()), int(crime['year'].max())
+
+    scores = calculate_safety_scores(crime, start_year, end_year)
+    clusters, centers, model = cluster_districts(crime, data['prices'], CLUSTER_K, RANDOM_STATE)
+    amenities, correlations = calculate_amenity_scores(
+        crime, data['prices'], data['population'], data['transport_metrics'], data['school_metrics'])
+
+    districts = scores.merge(clusters[['district', 'cluster', 'cluster_strategy', 'PC1', 'PC2']], on='district')
+    districts = districts.merge(amenities[['district', 'avg_price', 'transport_density', 'school_density',
+                                           'quality_score', 'value_score', 'recommendation']], on='district')
+    districts = districts.sort_values('value_score', ascending=False).reset_index(drop=True)
+    centers['districts'] = centers['cluster'].map(clusters.groupby('cluster')['district'].apply(', '.join))
+
+    data_version = cache_key('data', data)[:12]
+    slugs = {d: slugify(d) for d in sorted(districts['district'])}
+    nav = '<a href="index.html">Berlin</a>' + ''.join(
+        f'<a href="{slug}.html">{html.escape(d)}</a>' for d, slug in slugs.items())
+
+    # City summary
+    city_figures = [
+        ('Safety Scores', cache.figure('safety_overview', {'scores': scores})),
+        ('Neighborhood Clusters', cache.figure('cluster_pca', {
+            'clusters': clusters[['district', 'cluster', 'PC1', 'PC2']],
+            'centers': centers[['cluster', 'center_PC1', 'center_PC2', 'strategy']],
+            'explained_variance': model['explained_variance']})),
+        ('Amenity Impact on Prices', cache.figure('amenity_correlations', {
+            'amenities': amenities[['district', 'avg_price', 'transport_density', 'school_density',
+                                    'crime_per_100k', 'amenity_score']],
+            'correlations': correlations})),
+    ]
+    model_summary = f"K-Means K={CLUSTER_K}, silhouette {model['silhouette']:.3f}, inertia {model['inertia']:.2f}"
+    city_tables = [
+        ('District Rankings', 'ranking_table', {'districts': districts}, build_ranking_table),
+        ('Investment Strategy by Cluster', 'cluster_table', {'centers': centers}, build_cluster_table),
+    ]
+    city_sections = [(heading, cache.table(kind, payload, build)) for heading, kind, payload, build in city_tables]
+    city_sections[-1] = (city_sections[-1][0], city_sections[-1][1] + f"<p>{html.escape(model_summary)}</p>")
+    city_sections += [(heading, _figure_html(path, heading)) for heading, path in city_figures]
+
+    city_title = 'Berlin Property Intelligence: City Summary'
+    pages = {'index': render_page(city_title, nav, city_sections, footer=f"Data version {data_version}")}
+    pdfs = {}
+    if pdf:
+        pdfs['index'] = cache.pdf(city_title, model_summary, _table_frames(city_tables), city_figures)
+
+    # District reports
+    yearly = crime.groupby(['district', 'year'])['total_number_cases'].sum().reset_index()
+    latest = crime[(crime['year'] == end_year) & ~crime['crime_type_english'].isin(AGGREGATE_CRIME_TYPES)]
+    figure_scores = scores[['district', 'total_safety_score']]
+    figure_positions = districts[['district', 'cluster', 'quality_score', 'avg_price']]
+
+    for district, slug in slugs.items():
+        row = districts[districts['district'] == district].iloc[0].to_dict()
+        row.update(safety_rank=int(scores.index[scores['district'] == district][0]) + 1,
+                   district_count=len(scores), start_year=start_year, end_year=end_year)
+        crime_types = (latest[latest['district'] == district]
+                       .groupby(['crime_type_english', 'category'])['total_number_cases'].sum()
+                       .nlargest(10).reset_index())
+
+        figures = [
+            ('Safety Ranking', cache.figure('district_safety_rank',
+                                            {'scores': figure_scores, 'district': district})),
+            ('Crime Trend', cache.figure('district_crime_trend', {
+                'yearly': yearly[yearly['district'] == district][['year', 'total_number_cases']],
+                'district': district})),
+            ('Value Position', cache.figure('district_value_position',
+                                            {'districts': figure_positions, 'district': district})),
+        ]
+        tables = [
+            ('Key Metrics', 'district_metrics', {'row': row}, build_district_metrics_table),
+            (f'Top Crime Types ({end_year})', 'district_crime_types', {'crime_types': crime_types},
+             build_crime_types_table),
+        ]
+        sections = [(heading, cache.table(kind, payload, build)) for heading, kind, payload, build in tables]
+        sections += [(heading, _figure_html(path, heading)) for heading, path in figures]
+
+        title = f'{district}: District Report'
+        pages[slug] = render_page(title, nav, sections)
+        if pdf:
+            highlight = (f"Recommendation: {row['recommendation']}  |  Cluster strategy: {row['cluster_strategy']}"
+                         f"  |  Safety: {row['total_safety_score']:.0f}/100 {row['safety_tier']}")
+            pdfs[slug] = cache.pdf(title, highlight, _table_frames(tables), figures)
+
+    # Draw every missing figure and PDF before any page that references it is written
+    rendered = cache.render_pending(workers)
+
+    written = 0
+    for slug, content in pages.items():
+        written += write_if_changed(REPORTS_DIR / f"{slug}.html", content)
+    for slug, path in pdfs.items():
+        write_if_changed(REPORTS_DIR / f"{slug}.pdf", path.read_bytes())
+
+    # Reports for districts no longer in the data would otherwise linger, linked to
+    # nothing. Without --pdf every PDF is removed, since none was checked against
+    # the current data; the cache keeps them so the next --pdf run restores them.
+    removed = 0
+    for path in list(REPORTS_DIR.glob('*.html')) + list(REPORTS_DIR.glob('*.pdf')):
+        if path.stem not in (pages if path.suffix == '.html' else pdfs):
+            path.unlink()
+            removed += 1
+
+    return len(pages), written, removed, rendered
+
+
+def _positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be an integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Generate static Berlin district reports")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database path")
+    parser.add_argument('--workers', type=_positive_int, default=os.cpu_count() or 1,
+                        help="Figure rendering processes")
+    parser.add_argument('--pdf', action='store_true',
+                        help="Also write each report as a PDF (without it, old PDFs are removed)")
+    parser.add_argument('--force', action='store_true', help="Ignore the cache and redraw everything")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📄 BERLIN PROPERTY INTELLIGENCE - REPORT GENERATION")
+    print("=" * 60)
+
+    if not os.path.exists(args.db):
+        print(f"❌ Error: Database not found: {args.db}")
+        sys.exit(1)  # Non-zero so a nightly scheduler sees the failure
+
+    start = time.perf_counter()
+    data = load_data(args.db)
+    print(f"\n📊 Loaded {len(data['crime']):,} crime records for {data['crime']['district'].nunique()} districts")
+
+    cache = SectionCache(CACHE_DIR, force=args.force)
+    pages, written, removed, rendered = build_reports(data, cache, args.workers, pdf=args.pdf)
+    pruned = cache.prune()
+
+    print(f"✅ Sections: {cache.hits['sections']} cached, {cache.misses['sections']} rebuilt "
+          f"({rendered} figures drawn)")
+    if args.pdf:
+        print(f"✅ PDFs: {cache.hits['pdfs']} cached, {cache.misses['pdfs']} rebuilt")
+    print(f"✅ Reports: {written}/{pages} updated, {removed} stale reports removed")
+    print(f"✅ Cache: {pruned} stale entries removed")
+    print(f"\n📂 Reports location: {REPORTS_DIR / 'index.html'}")
+    print(f"⏱️  Finished in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()